@@ -1,5 +1,8 @@
 """Database configuration with async SQLAlchemy."""
 
+import asyncio
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from typing import AsyncGenerator
@@ -13,7 +16,16 @@ engine = create_async_engine(
     settings.database_url,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
     echo=settings.debug,
+    connect_args={
+        # Per-connection LRU of prepared statements kept by SQLAlchemy's asyncpg
+        # dialect. asyncpg's own statement_cache_size is not set: SQLAlchemy
+        # prepares with use_cache=False, so it would have no effect
+        "prepared_statement_cache_size": settings.database_prepared_statement_cache_size,
+        # JIT compilation stalls asyncpg type introspection queries
+        "server_settings": {"jit": "off"},
+    },
 )
 
 # Session factory
@@ -40,3 +52,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def warm_pool(
+    size: int = settings.database_pool_min_size,
+    timeout: float = settings.database_pool_warmup_timeout,
+) -> None:
+    """Open ``size`` pooled connections up front so early requests skip connect latency.
+
+    Gives up with :class:`asyncio.TimeoutError` after ``timeout`` seconds so an
+    unreachable database cannot hold up startup.
+    """
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Connections are held concurrently so each ping gets its own
+    pings = asyncio.gather(*(ping() for _ in range(min(size, settings.database_pool_size))))
+    await asyncio.wait_for(pings, timeout)
@@ -1,24 +1,45 @@
 """NetSentinel API - FastAPI application."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from .config import get_settings
+from .database import engine, warm_pool
 from .routers import auth_router, devices_router, flows_router, stats_router
+from .utils.cache import ResponseCacheMiddleware
 
 settings = get_settings()
 
+# Settings-derived values, resolved once at import
+CORS_ORIGINS = tuple(settings.cors_origins.split(","))
+HEALTH_RESPONSE = {"status": "healthy", "version": settings.app_version}
+ROOT_RESPONSE = {
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "docs": "/docs",
+    "health": "/health",
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print(f"Starting {settings.app_name} v{settings.app_version}")
+    try:
+        await warm_pool()
+    except asyncio.TimeoutError:
+        print(f"Database pool warm-up timed out after {settings.database_pool_warmup_timeout}s")
+    except Exception as exc:
+        print(f"Database pool warm-up failed: {exc}")
     yield
     # Shutdown
     print("Shutting down...")
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -28,15 +49,28 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Short-lived cache for polled read endpoints (registered first so CORS wraps it)
+app.add_middleware(
+    ResponseCacheMiddleware,
+    paths=["/api/v1/stats/dashboard", "/api/v1/devices", "/api/v1/flows"],
+    ttl=settings.response_cache_ttl,
+    invalidate_prefixes=["/api/v1/devices"],
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress JSON bodies outermost, so cached bodies and headers stay uncompressed
+# and each hit is encoded for its own Accept-Encoding.
+# A low compresslevel keeps CPU per large page modest.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(devices_router, prefix="/api/v1")
@@ -47,15 +81,10 @@ app.include_router(stats_router, prefix="/api/v1")
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": settings.app_version}
+    return HEALTH_RESPONSE
 
 
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "docs": "/docs",
-        "health": "/health",
-    }
+    return ROOT_RESPONSE
@@ -1,7 +1,19 @@
 """SQLAlchemy models."""
 
-from .device import Device, DeviceIP
-from .flow import TrafficFlow
-from .user import User
+from importlib import import_module
+
+# Exported name -> model module, imported on first access (PEP 562)
+_MODEL_MODULES = {
+    "Device": ".device",
+    "DeviceIP": ".device",
+    "TrafficFlow": ".flow",
+    "User": ".user",
+}
 
 __all__ = ["Device", "DeviceIP", "TrafficFlow", "User"]
+
+
+def __getattr__(name: str):
+    if name in _MODEL_MODULES:
+        return getattr(import_module(_MODEL_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
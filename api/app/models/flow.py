@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, SmallInteger
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, SmallInteger, desc
 from sqlalchemy.dialects.postgresql import INET, MACADDR, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,6 +15,11 @@ class TrafficFlow(Base):
     """Traffic flow between two devices."""
 
     __tablename__ = "traffic_flows"
+    __table_args__ = (
+        # Serve per-device flow listings in (last_seen, id) keyset order
+        Index("idx_flows_src_device_last_seen", "src_device_id", desc("last_seen"), desc("id")),
+        Index("idx_flows_dst_device_last_seen", "dst_device_id", desc("last_seen"), desc("id")),
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     src_device_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("devices.id", ondelete="SET NULL"))
@@ -1,8 +1,19 @@
 """API routers."""
 
-from .devices import router as devices_router
-from .flows import router as flows_router
-from .stats import router as stats_router
-from .auth import router as auth_router
+from importlib import import_module
+
+# Exported name -> router module, imported on first access (PEP 562)
+_ROUTER_MODULES = {
+    "devices_router": ".devices",
+    "flows_router": ".flows",
+    "stats_router": ".stats",
+    "auth_router": ".auth",
+}
 
 __all__ = ["devices_router", "flows_router", "stats_router", "auth_router"]
+
+
+def __getattr__(name: str):
+    if name in _ROUTER_MODULES:
+        return import_module(_ROUTER_MODULES[name], __name__).router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,27 +1,50 @@
 """Device API endpoints."""
 
-from math import ceil
-from typing import Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import distinct, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from ..database import get_db
 from ..models.device import Device, DeviceIP
 from ..schemas.device import DeviceListResponse, DeviceResponse, DeviceUpdate
+from ..utils.pagination import SortOrder, fetch_page, page_count, window_total
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
-
-def device_to_response(device: Device) -> DeviceResponse:
-    """Convert Device model to response schema."""
-    ip_addresses = [str(ip.ip_address) for ip in device.ips]
-    vlans = list(set(ip.vlan_id for ip in device.ips if ip.vlan_id is not None))
-
-    return DeviceResponse(
+DeviceSortField = Literal[
+    "mac_address", "device_name", "first_seen", "last_seen", "total_bytes_sent", "total_bytes_received"
+]
+DEVICE_SORT_COLUMNS = {
+    "mac_address": Device.mac_address,
+    "device_name": Device.device_name,
+    "first_seen": Device.first_seen,
+    "last_seen": Device.last_seen,
+    "total_bytes_sent": Device.total_bytes_sent,
+    "total_bytes_received": Device.total_bytes_received,
+}
+
+
+def device_to_response(
+    device: Device,
+    ip_addresses: Optional[List[str]] = None,
+    vlans: Optional[List[int]] = None,
+) -> DeviceResponse:
+    """Convert Device model to response schema.
+
+    IP addresses and VLANs may be passed in pre-aggregated by the query;
+    otherwise they are derived from the loaded ``device.ips``. ``device`` may
+    also be a result row carrying the device columns.
+    """
+    if ip_addresses is None:
+        ip_addresses = [str(ip.ip_address) for ip in device.ips]
+    if vlans is None:
+        vlans = list(set(ip.vlan_id for ip in device.ips if ip.vlan_id is not None))
+
+    return DeviceResponse.model_construct(
         id=device.id,
         mac_address=str(device.mac_address),
         oui_vendor=device.oui_vendor,
@@ -51,12 +74,20 @@ async def list_devices(
     is_active: Optional[bool] = None,
     is_flagged: Optional[bool] = None,
     vlan_id: Optional[int] = None,
-    sort_by: str = Query("last_seen", regex="^(mac_address|device_name|first_seen|last_seen|total_bytes_sent|total_bytes_received)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    sort_by: DeviceSortField = "last_seen",
+    sort_order: SortOrder = "desc",
     db: AsyncSession = Depends(get_db),
 ):
     """List devices with pagination and filters."""
-    query = select(Device).options(selectinload(Device.ips))
+    # IPs and VLANs are aggregated per device in SQL rather than eager-loaded
+    ip_addresses = func.array_agg(DeviceIP.ip_address).filter(DeviceIP.id.isnot(None))
+    vlans = func.array_agg(distinct(DeviceIP.vlan_id)).filter(DeviceIP.vlan_id.isnot(None))
+    total_count = func.count().over().label("total_count")
+    query = (
+        select(Device, ip_addresses.label("ip_addresses"), vlans.label("vlans"), total_count)
+        .outerjoin(DeviceIP)
+        .group_by(Device.id)
+    )
 
     # Apply filters
     if search:
@@ -72,31 +103,35 @@ async def list_devices(
     if is_flagged is not None:
         query = query.where(Device.is_flagged == is_flagged)
     if vlan_id is not None:
-        query = query.join(DeviceIP).where(DeviceIP.vlan_id == vlan_id)
-
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
+        # Semi-join filters devices before grouping and leaves their IP aggregates whole
+        query = query.where(
+            Device.id.in_(select(DeviceIP.device_id).where(DeviceIP.vlan_id == vlan_id))
+        )
 
     # Apply sorting
-    sort_column = getattr(Device, sort_by)
+    sort_column = DEVICE_SORT_COLUMNS[sort_by]
     if sort_order == "desc":
         sort_column = sort_column.desc()
     query = query.order_by(sort_column)
 
     # Apply pagination
     offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    paged_query = query.offset(offset).limit(page_size)
 
-    result = await db.execute(query)
-    devices = result.scalars().unique().all()
+    # Total comes back alongside each row via the window function
+    result = await db.execute(paged_query)
+    rows = result.all()
+    total = await window_total(db, query, rows, page)
 
-    return DeviceListResponse(
-        items=[device_to_response(d) for d in devices],
+    return DeviceListResponse.model_construct(
+        items=[
+            device_to_response(row[0], [str(ip) for ip in row.ip_addresses or []], row.vlans or [])
+            for row in rows
+        ],
         total=total,
         page=page,
         page_size=page_size,
-        pages=ceil(total / page_size) if total > 0 else 1,
+        pages=page_count(total, page_size),
     )
 
 
@@ -119,26 +154,42 @@ async def get_device(
 @router.patch("/{device_id}", response_model=DeviceResponse)
 async def update_device(
     device_id: UUID,
-    update: DeviceUpdate,
+    device_update: DeviceUpdate,
     db: AsyncSession = Depends(get_db),
 ):
     """Update device metadata."""
-    query = select(Device).options(selectinload(Device.ips)).where(Device.id == device_id)
+    update_data = device_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_device(device_id, db)
+
+    # UPDATE ... RETURNING as a CTE, reading the device's IPs in the same statement
+    updated = (
+        update(Device)
+        .where(Device.id == device_id)
+        .values(**update_data)
+        .returning(*Device.__table__.c)
+        .cte("updated")
+    )
+    query = select(
+        updated,
+        select(func.array_agg(DeviceIP.ip_address))
+        .where(DeviceIP.device_id == updated.c.id)
+        .scalar_subquery()
+        .label("ip_addresses"),
+        select(func.array_agg(distinct(DeviceIP.vlan_id)))
+        .where(DeviceIP.device_id == updated.c.id, DeviceIP.vlan_id.isnot(None))
+        .scalar_subquery()
+        .label("vlans"),
+    )
     result = await db.execute(query)
-    device = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not device:
+    if not row:
         raise HTTPException(status_code=404, detail="Device not found")
 
-    # Update fields
-    update_data = update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(device, field, value)
-
     await db.commit()
-    await db.refresh(device)
 
-    return device_to_response(device)
+    return device_to_response(row, [str(ip) for ip in row.ip_addresses or []], row.vlans or [])
 
 
 @router.get("/{device_id}/flows")
@@ -146,9 +197,15 @@ async def get_device_flows(
     device_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous response; page is ignored when set"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get flows for a device."""
+    """Get flows for a device, most recent first.
+
+    Cursor pages return null ``total``/``pages``, as in ``list_flows``.
+    """
     from ..models.flow import TrafficFlow
     from ..schemas.flow import FlowListResponse, FlowResponse
 
@@ -162,22 +219,14 @@ async def get_device_flows(
     query = select(TrafficFlow).where(
         (TrafficFlow.src_device_id == device_id)
         | (TrafficFlow.dst_device_id == device_id)
-    ).order_by(TrafficFlow.last_seen.desc())
-
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
-
-    # Paginate
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-
-    result = await db.execute(query)
-    flows = result.scalars().all()
+    )
+    flows, total, next_cursor = await fetch_page(
+        db, query, TrafficFlow, page, page_size, "last_seen", "desc", cursor
+    )
 
-    return FlowListResponse(
+    return FlowListResponse.model_construct(
         items=[
-            FlowResponse(
+            FlowResponse.model_construct(
                 id=f.id,
                 src_mac=str(f.src_mac),
                 src_ip=str(f.src_ip) if f.src_ip else None,
@@ -197,5 +246,6 @@ async def get_device_flows(
         total=total,
         page=page,
         page_size=page_size,
-        pages=ceil(total / page_size) if total > 0 else 1,
+        pages=page_count(total, page_size),
+        next_cursor=next_cursor,
     )
@@ -1,35 +1,28 @@
 """Flow API endpoints."""
 
-from math import ceil
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models.flow import TrafficFlow
 from ..schemas.flow import FlowListResponse, FlowResponse
+from ..utils.pagination import SortOrder, fetch_page, page_count
+from ..utils.protocols import PROTOCOL_NAMES
 
 router = APIRouter(prefix="/flows", tags=["flows"])
 
-# Protocol name mapping
-PROTOCOL_NAMES = {
-    1: "ICMP",
-    6: "TCP",
-    17: "UDP",
-    47: "GRE",
-    50: "ESP",
-    89: "OSPF",
-}
+FlowSortField = Literal["first_seen", "last_seen", "packet_count", "byte_count"]
+
+_protocol_name = PROTOCOL_NAMES.get
 
 
 def flow_to_response(flow: TrafficFlow) -> FlowResponse:
     """Convert Flow model to response schema."""
-    protocol_name = PROTOCOL_NAMES.get(flow.ip_protocol) if flow.ip_protocol else None
-
-    return FlowResponse(
+    return FlowResponse.model_construct(
         id=flow.id,
         src_mac=str(flow.src_mac),
         src_ip=str(flow.src_ip) if flow.src_ip else None,
@@ -39,7 +32,7 @@ def flow_to_response(flow: TrafficFlow) -> FlowResponse:
         dst_port=flow.dst_port,
         vlan_id=flow.vlan_id,
         ip_protocol=flow.ip_protocol,
-        protocol_name=protocol_name,
+        protocol_name=_protocol_name(flow.ip_protocol),
         first_seen=flow.first_seen,
         last_seen=flow.last_seen,
         packet_count=flow.packet_count,
@@ -58,11 +51,22 @@ async def list_flows(
     vlan_id: Optional[int] = None,
     protocol: Optional[int] = None,
     port: Optional[int] = None,
-    sort_by: str = Query("last_seen", regex="^(first_seen|last_seen|packet_count|byte_count)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    sort_by: FlowSortField = "last_seen",
+    sort_order: SortOrder = "desc",
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous response; page is ignored when set"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
-    """List flows with pagination and filters."""
+    """List flows with pagination and filters.
+
+    When sorting by ``last_seen``, pass the ``next_cursor`` of the previous
+    response as ``cursor`` to page without OFFSET. ``page`` is then ignored and
+    only echoed back, and ``total``/``pages`` are returned as null: counting
+    would rescan every matching flow on each page, so clients should keep the
+    total from the first (non-cursor) page. A cursor with any other ``sort_by``
+    is rejected with 400.
+    """
     query = select(TrafficFlow)
 
     # Apply filters
@@ -83,29 +87,17 @@ async def list_flows(
             (TrafficFlow.src_port == port) | (TrafficFlow.dst_port == port)
         )
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
-
-    # Apply sorting
-    sort_column = getattr(TrafficFlow, sort_by)
-    if sort_order == "desc":
-        sort_column = sort_column.desc()
-    query = query.order_by(sort_column)
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-
-    result = await db.execute(query)
-    flows = result.scalars().all()
+    flows, total, next_cursor = await fetch_page(
+        db, query, TrafficFlow, page, page_size, sort_by, sort_order, cursor
+    )
 
-    return FlowListResponse(
+    return FlowListResponse.model_construct(
         items=[flow_to_response(f) for f in flows],
         total=total,
         page=page,
         page_size=page_size,
-        pages=ceil(total / page_size) if total > 0 else 1,
+        pages=page_count(total, page_size),
+        next_cursor=next_cursor,
     )
 
 
@@ -1,31 +1,33 @@
 """Statistics API endpoints."""
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from sqlalchemy import JSON, Numeric, String, case, cast, func, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models.device import Device, DeviceIP
 from ..models.flow import TrafficFlow
 from ..schemas.stats import DashboardStats, ProtocolStats, TopTalker, VlanStats
+from ..utils.protocols import PROTOCOL_NAMES
 
 router = APIRouter(prefix="/stats", tags=["statistics"])
 
-# Protocol name mapping
-PROTOCOL_NAMES = {
-    1: "ICMP",
-    6: "TCP",
-    17: "UDP",
-    47: "GRE",
-    50: "ESP",
-    89: "OSPF",
-}
 
-ETHERTYPE_NAMES = {
-    0x0800: "IPv4",
-    0x0806: "ARP",
-    0x86DD: "IPv6",
-}
+def _protocol_name_sql(ip_protocol):
+    """SQL expression resolving an IP protocol number to its display name."""
+    return case(
+        ((ip_protocol.is_(None)) | (ip_protocol == 0), "Unknown"),
+        *((ip_protocol == num, name) for num, name in PROTOCOL_NAMES.items()),
+        else_="Proto " + cast(ip_protocol, String),
+    )
+
+
+def _json_rows(cte, order_by):
+    """Aggregate a CTE into a JSON array of row arrays, preserving order."""
+    return select(
+        func.json_agg(aggregate_order_by(func.json_build_array(*cte.c), order_by), type_=JSON)
+    ).scalar_subquery()
 
 
 @router.get("/dashboard", response_model=DashboardStats)
@@ -34,51 +36,39 @@ async def get_dashboard_stats(
 ):
     """Get dashboard statistics."""
     # Device counts
-    total_devices = await db.scalar(select(func.count(Device.id))) or 0
-    active_devices = await db.scalar(
-        select(func.count(Device.id)).where(Device.is_active == True)
-    ) or 0
+    device_counts = select(
+        func.count(Device.id).label("total"),
+        func.count(Device.id).filter(Device.is_active == True).label("active"),
+    ).cte("device_counts")
 
-    # Flow counts
-    total_flows = await db.scalar(select(func.count(TrafficFlow.id))) or 0
-
-    # Total packets and bytes
-    flow_stats = await db.execute(
-        select(
-            func.sum(TrafficFlow.packet_count),
-            func.sum(TrafficFlow.byte_count),
-        )
-    )
-    row = flow_stats.one()
-    total_packets = row[0] or 0
-    total_bytes = row[1] or 0
+    # Flow count, total packets and bytes
+    flow_totals = select(
+        func.count(TrafficFlow.id).label("flows"),
+        func.sum(TrafficFlow.packet_count).label("packets"),
+        func.sum(TrafficFlow.byte_count).label("bytes"),
+    ).cte("flow_totals")
 
     # Protocol distribution
-    protocol_query = await db.execute(
+    protos = (
         select(
-            TrafficFlow.ip_protocol,
+            _protocol_name_sql(TrafficFlow.ip_protocol).label("protocol_name"),
             func.sum(TrafficFlow.packet_count).label("packets"),
             func.sum(TrafficFlow.byte_count).label("bytes"),
+            # Share of all packets; the window sums every group before LIMIT
+            func.round(
+                cast(func.sum(TrafficFlow.packet_count), Numeric) * 100
+                / func.nullif(func.sum(func.sum(TrafficFlow.packet_count)).over(), 0),
+                2,
+            ).label("percentage"),
         )
         .group_by(TrafficFlow.ip_protocol)
         .order_by(func.sum(TrafficFlow.packet_count).desc())
         .limit(10)
+        .cte("protos")
     )
-    protocols = []
-    for row in protocol_query:
-        proto_num = row[0]
-        proto_name = PROTOCOL_NAMES.get(proto_num, f"Proto {proto_num}") if proto_num else "Unknown"
-        protocols.append(
-            ProtocolStats(
-                protocol_name=proto_name,
-                packet_count=row[1] or 0,
-                byte_count=row[2] or 0,
-                percentage=round((row[1] or 0) / total_packets * 100, 2) if total_packets > 0 else 0,
-            )
-        )
 
     # Top talkers (devices by total bytes)
-    top_talkers_query = await db.execute(
+    talkers = (
         select(
             Device.mac_address,
             Device.device_name,
@@ -88,20 +78,11 @@ async def get_dashboard_stats(
         )
         .order_by((Device.total_bytes_sent + Device.total_bytes_received).desc())
         .limit(10)
+        .cte("talkers")
     )
-    top_talkers = [
-        TopTalker(
-            mac_address=str(row[0]),
-            device_name=row[1],
-            device_type=row[2],
-            bytes_total=row[3] or 0,
-            packets_total=row[4] or 0,
-        )
-        for row in top_talkers_query
-    ]
 
     # VLAN statistics
-    vlan_query = await db.execute(
+    vlan_stats = (
         select(
             DeviceIP.vlan_id,
             func.count(func.distinct(DeviceIP.device_id)).label("device_count"),
@@ -110,24 +91,63 @@ async def get_dashboard_stats(
         )
         .where(DeviceIP.vlan_id.isnot(None))
         .group_by(DeviceIP.vlan_id)
-        .order_by(func.count(func.distinct(DeviceIP.device_id)).desc())
+        .cte("vlan_stats")
     )
+
+    # Everything in one round-trip; list sections come back as JSON arrays
+    result = await db.execute(
+        select(
+            device_counts.c.total,
+            device_counts.c.active,
+            flow_totals.c.flows,
+            flow_totals.c.packets,
+            flow_totals.c.bytes,
+            _json_rows(protos, protos.c.packets.desc()).label("protocols"),
+            _json_rows(talkers, talkers.c.bytes_total.desc()).label("top_talkers"),
+            _json_rows(vlan_stats, vlan_stats.c.device_count.desc()).label("vlans"),
+        ).select_from(device_counts.join(flow_totals, true()))
+    )
+    row = result.one()
+
+    # List sections arrive as JSON arrays of plain values (MACs already text),
+    # so rows are tuple-unpacked and trusted without re-validation
+    protocols = [
+        ProtocolStats.model_construct(
+            protocol_name=name,
+            packet_count=packets or 0,
+            byte_count=byte_count or 0,
+            percentage=percentage or 0,
+        )
+        for name, packets, byte_count, percentage in row.protocols or []
+    ]
+
+    top_talkers = [
+        TopTalker.model_construct(
+            mac_address=mac,
+            device_name=name,
+            device_type=device_type,
+            bytes_total=bytes_total or 0,
+            packets_total=packets_total or 0,
+        )
+        for mac, name, device_type, bytes_total, packets_total in row.top_talkers or []
+    ]
+
     vlans = [
-        VlanStats(
-            vlan_id=row[0],
-            device_count=row[1] or 0,
-            packet_count=row[2] or 0,
-            byte_count=row[3] or 0,
+        VlanStats.model_construct(
+            vlan_id=vlan_id,
+            device_count=device_count or 0,
+            packet_count=packets or 0,
+            byte_count=byte_count or 0,
         )
-        for row in vlan_query
+        for vlan_id, device_count, packets, byte_count in row.vlans or []
     ]
 
     return DashboardStats(
-        total_devices=total_devices,
-        active_devices=active_devices,
-        total_flows=total_flows,
-        total_packets=total_packets,
-        total_bytes=total_bytes,
+        total_devices=row.total or 0,
+        active_devices=row.active or 0,
+        total_flows=row.flows or 0,
+        total_packets=row.packets or 0,
+        total_bytes=row.bytes or 0,
         protocols=protocols,
         top_talkers=top_talkers,
         vlans=vlans,
@@ -31,7 +31,9 @@ class FlowResponse(BaseModel):
 class FlowListResponse(BaseModel):
     """Paginated flow list response."""
     items: List[FlowResponse]
-    total: int
+    # Omitted (null) on cursor pages, where counting would scan every match
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
@@ -0,0 +1,103 @@
+"""In-memory response cache for read-heavy GET endpoints."""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# (expires_at, status, headers, body)
+CacheEntry = Tuple[float, int, List[Tuple[bytes, bytes]], bytes]
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GETs on selected paths from memory for a short TTL.
+
+    Entries are keyed by path and raw query string, so every page/filter
+    combination is cached independently. Any successful mutating request
+    under one of ``invalidate_prefixes`` drops the whole cache.
+
+    The cache and its invalidation are local to one process. With several
+    uvicorn workers, a PATCH only clears the worker that served it; the
+    others keep serving their entries until ``ttl`` expires, so ``ttl`` bounds
+    how stale a read can be.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str],
+        ttl: int = 10,
+        invalidate_prefixes: Iterable[str] = (),
+        max_entries: int = 1024,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.ttl = ttl
+        self.invalidate_prefixes = tuple(invalidate_prefixes)
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, bytes], CacheEntry] = {}
+        # Bumped on every invalidation so in-flight GETs can tell they raced one
+        self._generation = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.ttl <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if method == "GET" and path in self.paths:
+            await self._serve_cached(scope, receive, send)
+        elif method not in ("GET", "HEAD", "OPTIONS") and path.startswith(self.invalidate_prefixes):
+            await self._serve_invalidating(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _serve_cached(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = (scope["path"], scope["query_string"])
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            _, status, headers, body = entry
+            # Outer middleware (CORS, GZip) edits headers in place: never hand out the cached list
+            await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        generation = self._generation
+        status: Optional[int] = None
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                # Snapshot before outer middleware gets a chance to modify the message
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and status == 200:
+                chunks.append(message.get("body", b""))
+                # Skip storing if an invalidation happened while this GET ran
+                if not message.get("more_body", False) and generation == self._generation:
+                    self._store(key, (now + self.ttl, 200, headers, b"".join(chunks)))
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+    async def _serve_invalidating(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_and_invalidate(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self._entries.clear()
+                self._generation += 1
+            await send(message)
+
+        await self.app(scope, receive, send_and_invalidate)
+
+    def _store(self, key: Tuple[str, bytes], entry: CacheEntry) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                # Still full of live entries: evict the oldest insertion
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = entry
@@ -0,0 +1,112 @@
+"""Offset and keyset pagination helpers."""
+
+import base64
+from datetime import datetime
+from math import ceil
+from typing import Any, List, Literal, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SortOrder = Literal["asc", "desc"]
+
+
+def encode_cursor(last_seen: datetime, row_id: UUID) -> str:
+    """Encode a ``(last_seen, id)`` position as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{last_seen.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    try:
+        last_seen, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(last_seen), UUID(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def count_matches(db: AsyncSession, query: Select) -> int:
+    """Count the rows matched by ``query``."""
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery())) or 0
+
+
+async def window_total(db: AsyncSession, query: Select, rows: List[Any], page: int) -> int:
+    """Read the total from the ``total_count`` window column carried by ``rows``.
+
+    A page past the end has no rows to carry it, so the matches are counted.
+    """
+    if rows:
+        return rows[0].total_count
+    if page > 1:
+        return await count_matches(db, query)
+    return 0
+
+
+def page_count(total: Optional[int], page_size: int) -> Optional[int]:
+    """Number of pages for ``total`` matches, ``None`` when the total is unknown."""
+    if total is None:
+        return None
+    return ceil(total / page_size) if total > 0 else 1
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    page: int,
+    page_size: int,
+    sort_by: str,
+    sort_order: SortOrder,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """Fetch one page of ``model`` rows matching ``query``.
+
+    When sorting by ``last_seen``, rows are ordered by ``(last_seen, id)`` and a
+    ``cursor`` from the previous page seeks directly past it instead of using
+    OFFSET; ``page`` is ignored in that case. A cursor combined with any other
+    sort column is rejected with 400. Returns the rows, the total number of
+    matches (``None`` in cursor mode, so each page costs only ``page_size``
+    rows) and the cursor for the next page (``None`` on the last page or for
+    other sort columns).
+    """
+    keyset = sort_by == "last_seen"
+    if cursor and not keyset:
+        raise HTTPException(status_code=400, detail="cursor requires sort_by=last_seen")
+    order = [getattr(model, sort_by), model.id] if keyset else [getattr(model, sort_by)]
+    descending = sort_order == "desc"
+    if descending:
+        order = [column.desc() for column in order]
+
+    if cursor:
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        position = tuple_(model.last_seen, model.id)
+        bound = tuple_(cursor_ts, cursor_id)
+        paged_query = (
+            query.where(position < bound if descending else position > bound)
+            .order_by(*order)
+            .limit(page_size + 1)
+        )
+        # Counting would rescan every match on each page; the client keeps
+        # the total from the first, non-cursor page instead
+        total = None
+        items = list((await db.execute(paged_query)).scalars().all())
+    else:
+        offset = (page - 1) * page_size
+        paged_query = query.order_by(*order).offset(offset).limit(page_size + 1)
+        items = list((await db.execute(paged_query)).scalars().all())
+        if 0 < len(items) <= page_size or (not items and page == 1):
+            # On the last page the total follows from the offset, no count needed
+            total = offset + len(items)
+        else:
+            total = await count_matches(db, query)
+
+    # One extra row was fetched to tell whether another page follows
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        if keyset:
+            next_cursor = encode_cursor(items[-1].last_seen, items[-1].id)
+
+    return items, total, next_cursor
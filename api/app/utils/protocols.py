@@ -0,0 +1,20 @@
+"""Protocol and EtherType display names."""
+
+from types import MappingProxyType
+
+# IP protocol number -> name
+PROTOCOL_NAMES = MappingProxyType({
+    1: "ICMP",
+    6: "TCP",
+    17: "UDP",
+    47: "GRE",
+    50: "ESP",
+    89: "OSPF",
+})
+
+# EtherType -> name
+ETHERTYPE_NAMES = MappingProxyType({
+    0x0800: "IPv4",
+    0x0806: "ARP",
+    0x86DD: "IPv6",
+})
@@ -0,0 +1,151 @@
+"""Tests for the in-memory response cache middleware."""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from app.utils.cache import ResponseCacheMiddleware
+
+
+def make_client():
+    """Build an app with the same middleware order as ``app.main``."""
+    app = FastAPI()
+    calls = {"count": 0}
+
+    @app.get("/api/v1/devices")
+    async def list_devices(page: int = 1):
+        calls["count"] += 1
+        return {"page": page, "calls": calls["count"]}
+
+    @app.get("/api/v1/flows")
+    async def list_flows():
+        calls["count"] += 1
+        return {"items": [{"src_mac": "aa:bb:cc:dd:ee:ff", "packet_count": i} for i in range(100)]}
+
+    @app.patch("/api/v1/devices/{device_id}")
+    async def update_device(device_id: str):
+        return {"id": device_id}
+
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        paths=["/api/v1/devices", "/api/v1/flows"],
+        ttl=60,
+        invalidate_prefixes=["/api/v1/devices"],
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["https://a.example", "https://b.example"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+    return TestClient(app), calls
+
+
+def test_repeated_get_is_served_from_cache():
+    client, calls = make_client()
+
+    assert client.get("/api/v1/devices").json() == {"page": 1, "calls": 1}
+    assert client.get("/api/v1/devices").json() == {"page": 1, "calls": 1}
+    assert calls["count"] == 1
+
+
+def test_query_string_is_part_of_the_key():
+    client, calls = make_client()
+
+    client.get("/api/v1/devices?page=1")
+    assert client.get("/api/v1/devices?page=2").json() == {"page": 2, "calls": 2}
+
+
+def test_successful_mutation_invalidates():
+    client, calls = make_client()
+
+    client.get("/api/v1/devices")
+    client.patch("/api/v1/devices/abc")
+    assert client.get("/api/v1/devices").json()["calls"] == 2
+
+
+def test_cache_hits_do_not_leak_headers_between_callers():
+    client, calls = make_client()
+    requests = [
+        ("https://a.example", "gzip"),
+        ("https://b.example", "identity"),
+        ("https://evil.example", "gzip"),
+    ]
+
+    responses = [
+        client.get("/api/v1/devices", headers={"Origin": origin, "Accept-Encoding": encoding})
+        for origin, encoding in requests
+    ]
+
+    assert calls["count"] == 1
+    assert responses[0].headers["access-control-allow-origin"] == "https://a.example"
+    assert responses[1].headers["access-control-allow-origin"] == "https://b.example"
+    assert "access-control-allow-origin" not in responses[2].headers
+    for response in responses:
+        assert response.headers["vary"] == "Origin"
+        assert response.json() == {"page": 1, "calls": 1}
+
+
+def test_cache_hits_are_compressed_per_request():
+    client, calls = make_client()
+    encodings = ["gzip", "gzip", "identity", "gzip"]
+
+    responses = [
+        client.get(
+            "/api/v1/flows",
+            headers={"Origin": "https://a.example", "Accept-Encoding": encoding},
+        )
+        for encoding in encodings
+    ]
+
+    assert calls["count"] == 1
+    for encoding, response in zip(encodings, responses):
+        assert response.headers.get("content-encoding") == (encoding if encoding == "gzip" else None)
+        assert response.headers["vary"] == "Origin, Accept-Encoding"
+        assert len(response.json()["items"]) == 100
+
+
+def test_get_in_flight_during_invalidation_is_not_stored():
+    calls = {"count": 0}
+
+    async def run():
+        release = asyncio.Event()
+
+        async def inner(scope, receive, send):
+            if scope["method"] == "GET":
+                calls["count"] += 1
+                if calls["count"] == 1:
+                    # First read started before the PATCH and finishes after it
+                    await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        cache = ResponseCacheMiddleware(
+            inner, paths=["/api/v1/devices"], ttl=60, invalidate_prefixes=["/api/v1/devices"]
+        )
+
+        async def request(method, path):
+            scope = {"type": "http", "method": method, "path": path, "query_string": b""}
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+
+            await cache(scope, None, send)
+            return messages
+
+        stale_get = asyncio.create_task(request("GET", "/api/v1/devices"))
+        await asyncio.sleep(0)
+        await request("PATCH", "/api/v1/devices/abc")
+        release.set()
+        await stale_get
+        await request("GET", "/api/v1/devices")
+
+    asyncio.run(run())
+
+    assert calls["count"] == 2
@@ -0,0 +1,110 @@
+"""Tests for the pagination helpers."""
+
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.models.flow import TrafficFlow
+from app.utils.pagination import decode_cursor, encode_cursor, fetch_page, window_total
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Returns canned page rows and records whether a count query ran."""
+
+    def __init__(self, rows, count=0):
+        self.rows = rows
+        self.count = count
+        self.count_queries = 0
+
+    async def execute(self, query):
+        return FakeResult(self.rows)
+
+    async def scalar(self, query):
+        self.count_queries += 1
+        return self.count
+
+
+def flow_page(db, page, cursor=None):
+    return asyncio.run(
+        fetch_page(db, select(TrafficFlow), TrafficFlow, page, 50, "last_seen", "desc", cursor)
+    )
+
+
+def test_cursor_round_trip():
+    last_seen = datetime(2026, 1, 31, 12, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_cursor(encode_cursor(last_seen, row_id)) == (last_seen, row_id)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_cursor_with_non_keyset_sort_is_rejected():
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            fetch_page(None, None, TrafficFlow, 1, 50, "packet_count", "desc", cursor)
+        )
+    assert exc.value.status_code == 400
+
+
+def test_last_page_total_is_derived_without_counting():
+    db = FakeSession(rows=[object()] * 10)
+
+    items, total, next_cursor = flow_page(db, page=3)
+
+    assert (len(items), total, next_cursor) == (10, 110, None)
+    assert db.count_queries == 0
+
+
+def test_total_is_counted_when_more_pages_follow():
+    rows = [
+        TrafficFlow(id=uuid4(), last_seen=datetime.now(timezone.utc))
+        for _ in range(51)
+    ]
+    db = FakeSession(rows=rows, count=500)
+
+    items, total, next_cursor = flow_page(db, page=1)
+
+    assert (len(items), total) == (50, 500)
+    assert next_cursor is not None
+    assert db.count_queries == 1
+
+
+def test_window_total_counts_only_past_the_end():
+    query = select(TrafficFlow)
+
+    assert asyncio.run(window_total(FakeSession([]), query, [], page=1)) == 0
+    past_end = FakeSession([], count=7)
+    assert asyncio.run(window_total(past_end, query, [], page=4)) == 7
+    assert past_end.count_queries == 1
+
+
+def test_cursor_pages_skip_the_count():
+    db = FakeSession(rows=[object()] * 10)
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+
+    items, total, next_cursor = flow_page(db, page=1, cursor=cursor)
+
+    assert (len(items), total, next_cursor) == (10, None, None)
+    assert db.count_queries == 0
@@ -0,0 +1,13 @@
+-- NetSentinel - Flow Device Indexes
+-- Version: 002
+-- Description: Composite indexes for per-device flow listings ordered by recency
+
+-- Device flow listings filter on src/dst device and page by (last_seen, id)
+CREATE INDEX IF NOT EXISTS idx_flows_src_device_last_seen
+    ON traffic_flows(src_device_id, last_seen DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_flows_dst_device_last_seen
+    ON traffic_flows(dst_device_id, last_seen DESC, id DESC);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX IF EXISTS idx_flows_src_device;
+DROP INDEX IF EXISTS idx_flows_dst_device;